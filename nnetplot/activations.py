@@ -1,24 +1,30 @@
 """ Activation functions for plotting in network nodes.
     (the blue curves)
 """
+from functools import lru_cache
+
 import numpy as np
 
 
 def relu(x, y, radius):
-    if x <= 0:
-        return 0 - radius / 4
-    return x - radius / 4
+    return np.maximum(x, 0) - radius / 4
 
 
 def sigmoid(x, y, radius):
-    return radius / (1 + np.exp(-radius * 100 * x)) - radius / 2
+    # Logistic function via the tanh identity, which cannot overflow.
+    z = radius * 50 * x
+    return radius * 0.5 * (1 + np.tanh(z)) - radius / 2
 
 
 def linear(x, y, radius):
     return x
 
 
-def make_node_data(x, y, radius, activation):
+_BUILTINS = (relu, sigmoid, linear)
+_ACTIVATIONS = {"relu": relu, "sigmoid": sigmoid, "linear": linear}
+
+
+def make_node_data(x, y, radius, activation, num=50):
     """ Create data for a network node's activation
         function using the node center, it's radius 
         and an activation function.
@@ -33,25 +39,83 @@ def make_node_data(x, y, radius, activation):
         :type radius: node
 
         :param activation: activation function.
+
+        :param num: number of points sampled along the curve. Ignored
+                    for relu and linear, which only need their corners.
+        :type num: int
     """
-    X = np.linspace(x - radius, x + radius)
-    Y = [y + activation(xi - x, y, radius) for xi in X]
+    if _is_builtin(activation):
+        dx, dy = _curve_template(activation, radius, num)
+        return x + dx, y + dy
+    # User supplied activations may depend on y, so they are evaluated
+    # per node. Dispatching vectorizes scalar-only callables.
+    activation = dispatch_activation(activation)
+    X = np.linspace(x - radius, x + radius, num)
+    Y = y + activation(X - x, y, radius)
     return X, Y
 
 
-def dispacth_activation(s):
+def _is_builtin(activation):
+    """ Whether activation is one of the builtin activations,
+        which work on whole arrays of x and ignore y.
+    """
+    return any(activation is f for f in _BUILTINS)
+
+
+@lru_cache(maxsize=128)
+def _curve_template(activation, radius, num=50):
+    """ Activation curve for a node centered at the origin.
+        Nodes sharing radius and activation share the same
+        curve, so it is only computed once and translated.
+        Only valid for the builtin activations, which ignore y.
+        The piecewise linear activations are returned as
+        polylines through their corners.
+    """
+    if activation is linear:
+        dx = np.array([-radius, radius])
+    elif activation is relu:
+        dx = np.array([-radius, 0.0, radius])
+    else:
+        dx = np.linspace(-radius, radius, num)
+    dy = activation(dx, 0, radius)
+    dx.flags.writeable = False
+    dy.flags.writeable = False
+    return dx, dy
+
+
+def dispatch_activation(s):
     """ Get a callable corresponding to the
         activation string. In essence this translates
         from a string, e.g. 'sigmoid', to the sigmoid
-        function. If the input is already callable it 
-        is returned as is.
+        function. If the input is a user supplied callable
+        it is wrapped with np.vectorize, so it may be written
+        for scalar x.
     """
-    if callable(s):
+    if not callable(s):
+        return _ACTIVATIONS.get(s)
+    if _is_resolved(s):
         return s
-    elif s == "relu":
-        return relu
-    elif s == "sigmoid":
-        return sigmoid
-    elif s == "linear":
-        return linear
-    return None
+    try:
+        hash(s)
+    except TypeError:
+        return np.vectorize(s, excluded={1, 2}, otypes=[float])
+    return _vectorize(s)
+
+
+def _is_resolved(activation):
+    """ Whether activation is already usable on arrays as is,
+        i.e. dispatch_activation would return it unchanged.
+    """
+    return _is_builtin(activation) or isinstance(activation, (np.ufunc, np.vectorize))
+
+
+@lru_cache(maxsize=128)
+def _vectorize(activation):
+    """ Vectorize a user supplied activation over x only. The wrapper
+        is cached so the same function always maps to the same wrapper.
+    """
+    return np.vectorize(activation, excluded={1, 2}, otypes=[float])
+
+
+# Kept for backwards compatibility with the misspelled name.
+dispacth_activation = dispatch_activation
@@ -2,8 +2,36 @@
 """
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.path import Path
+from matplotlib.transforms import Affine2D
 
-from .activations import dispacth_activation, relu, sigmoid, linear, make_node_data
+from .activations import (
+    dispatch_activation,
+    dispacth_activation,
+    relu,
+    sigmoid,
+    linear,
+    make_node_data,
+    _is_resolved,
+)
+
+
+# Shared template for node clip paths, moved into place with _circle_transform.
+_UNIT_CIRCLE = Path.unit_circle()
+
+
+def _circle_transform(x, y, radius):
+    """ Transform taking the unit circle to a node circle in data coordinates.
+    """
+    return Affine2D().scale(radius).translate(x, y)
+
+
+def _curve_samples(radius):
+    """ Number of points to sample along an activation curve. Small
+        nodes cover few pixels, so fewer points suffice.
+    """
+    return min(50, max(10, int(200 * radius)))
 
 
 class Node:
@@ -24,14 +52,21 @@ class Node:
 
     :param special: Indicates that the layer does not have an activation function.
     :type special: bool
+
+    :param draw_activation: draw the activation curve inside the node.
+    :type draw_activation: bool
     """
 
-    def __init__(self, x, y, radius, activation, special=False):
+    def __init__(self, x, y, radius, activation, special=False, draw_activation=True):
         self.x = x
         self.y = y
         self.radius = radius
-        self.activation = dispacth_activation(activation)
+        if _is_resolved(activation):
+            self.activation = activation
+        else:
+            self.activation = dispatch_activation(activation)
         self.special = special
+        self.draw_activation = draw_activation
 
     def draw(self, axis):
         """ Draw the node on a supplied matplotlib axis.
@@ -43,13 +78,19 @@ class Node:
         )
         axis.add_patch(circle)
 
+        if not self.draw_activation:
+            return
+
         if not self.special:
             act = axis.plot(
-                *make_node_data(self.x, self.y, self.radius, self.activation),
+                *make_node_data(
+                    self.x, self.y, self.radius, self.activation, num=_curve_samples(self.radius)
+                ),
                 color="blue",
                 linewidth=5
             )
-            act[0].set_clip_path(circle)
+            clip_transform = _circle_transform(self.x, self.y, self.radius) + axis.transData
+            act[0].set_clip_path(_UNIT_CIRCLE, clip_transform)
 
         # TODO: do special stuff with input/output nodes?
         elif self.special == "input":
@@ -70,6 +111,7 @@ class Layer:
         radius=0.2,
         vspace=0.1,
         hspace=0.1,
+        draw_activations=True,
     ):
         """ A neural network layer, generally with horizontally aligned nodes.
 
@@ -100,6 +142,10 @@ class Layer:
         :param hspace: horizontal spacing between nodes. 
         :type hspace: float
 
+        :param draw_activations: draw activation curves inside the nodes in .draw_nodes.
+                                 Turning this off speeds up plotting of large layers.
+        :type draw_activations: bool
+
         Usage::
 
             >>> # First set up the layers you want to plot
@@ -144,27 +190,31 @@ class Layer:
         self.rows = rows
         self.columns = columns
         self.activation_str = activation
-        self.activation = dispacth_activation(activation)
+        self.activation = dispatch_activation(activation)
         self.special = special
         self.xanchor = xanchor
         self.yanchor = yanchor
         self.radius = radius
         self.vspace = vspace
         self.hspace = hspace
+        self.draw_activations = draw_activations
+        self._centers_cache = None
+        self._rect_cache = {}
+        self._rect_cache_key = None
 
     def inbound_node_connections(self):
         """ Connection points for inbound connections
-            to layer nodes.
+            to layer nodes, as two arrays (xs, ys).
         """
-        for x, y in self.node_centers():
-            yield x - 0.2 * self.radius, y
+        xs, ys = self._centers()
+        return xs - 0.2 * self.radius, ys
 
     def outbound_node_connections(self):
         """ Connection points for outbound connections
-            from layer nodes.
+            from layer nodes, as two arrays (xs, ys).
         """
-        for x, y in self.node_centers():
-            yield x + 0.2 * self.radius, y
+        xs, ys = self._centers()
+        return xs + 0.2 * self.radius, ys
 
     def inbound_rect_connections(self, pad=0.0, width=0.1):
         """ Connection points for inbound connections 
@@ -203,14 +253,37 @@ class Layer:
     def node_centers(self):
         """ Centerpoints of every node in the layer as pairs (xi, yi)
         """
-        x = self.xanchor + self.radius
-        y = self.yanchor - self.radius
-        for col_idx in range(self.columns):
-            for row_idx in range(self.rows):
-                yield (x, y)
-                y -= 2 * self.radius + self.vspace
-            y = self.yanchor - self.radius
-            x += 2 * self.radius + self.hspace
+        yield from zip(*self._centers())
+
+    def _centers(self):
+        """ Centerpoints of every node in the layer as two arrays (xs, ys),
+            ordered column by column. The arrays are cached until the
+            layer geometry changes.
+        """
+        key = self._geometry()
+        if self._centers_cache is None or self._centers_cache[0] != key:
+            col = np.arange(self.columns)
+            row = np.arange(self.rows)
+            x = self.xanchor + self.radius + col * (2 * self.radius + self.hspace)
+            y = self.yanchor - self.radius - row * (2 * self.radius + self.vspace)
+            xs, ys = np.meshgrid(x, y, indexing="ij")
+            self._centers_cache = (key, (xs.ravel(), ys.ravel()))
+        return self._centers_cache[1]
+
+    def _geometry(self):
+        """ Everything the layer's node and rectangle positions depend on.
+            Used to invalidate cached coordinates when the layer is moved,
+            e.g. by vertical_align or horizontal_align.
+        """
+        return (
+            self.xanchor,
+            self.yanchor,
+            self.radius,
+            self.rows,
+            self.columns,
+            self.vspace,
+            self.hspace,
+        )
 
     def rect_coords(self, pad=0):
         """ Coordinates identifying the layer rectangle.
@@ -218,23 +291,47 @@ class Layer:
             :param pad: Padding on all sides of the layer rectangle.
             :type pad: float
         """
-        coords = {
-            "xy": (self.xanchor - pad, self.yanchor + pad),
-            "width": 2 * self.radius * self.columns + 2 * pad + (self.columns - 1) * self.hspace,
-            "height": -(2 * self.radius * self.rows + 2 * pad + (self.rows - 1) * self.vspace),
-        }
-        return coords
+        key = self._geometry()
+        if self._rect_cache_key != key:
+            self._rect_cache = {}
+            self._rect_cache_key = key
+        if pad not in self._rect_cache:
+            width = 2 * self.radius * self.columns + 2 * pad + (self.columns - 1) * self.hspace
+            height = 2 * self.radius * self.rows + 2 * pad + (self.rows - 1) * self.vspace
+            self._rect_cache[pad] = {
+                "xy": (self.xanchor - pad, self.yanchor + pad),
+                "width": width,
+                "height": -height,
+            }
+        return dict(self._rect_cache[pad])
 
     def draw_nodes(self, axis):
         """ Draw the layer nodes.
         
         :param axis: matplotlib axis.
         """
-        for x, y in self.node_centers():
-            node = Node(
-                x=x, y=y, radius=self.radius, activation=self.activation, special=self.special
+        xs, ys = self._centers()
+        circles = [plt.Circle((x, y), radius=self.radius) for x, y in zip(xs, ys)]
+        axis.add_collection(PatchCollection(circles, facecolor="white", edgecolor="black"))
+
+        if self.draw_activations and not self.special:
+            # All activation curves go into a single NaN-separated line,
+            # clipped by the union of the node circles.
+            num = _curve_samples(self.radius)
+            curves = [
+                make_node_data(x, y, self.radius, self.activation, num=num)
+                for x, y in zip(xs, ys)
+            ]
+            X = np.concatenate([np.append(cx, np.nan) for cx, _ in curves])
+            Y = np.concatenate([np.append(cy, np.nan) for _, cy in curves])
+            act = axis.plot(X, Y, color="blue", linewidth=5)
+            clip = Path.make_compound_path(
+                *[
+                    _UNIT_CIRCLE.transformed(_circle_transform(x, y, self.radius))
+                    for x, y in zip(xs, ys)
+                ]
             )
-            node.draw(axis)
+            act[0].set_clip_path(clip, axis.transData)
 
     def draw_rect(self, axis, pad=0, draw_activation=True, **rectkw):
         """ Draw the layer rectangle.
@@ -267,8 +364,11 @@ class Layer:
             x = self.xanchor + 0.5 * coords["width"] - pad
             y = self.yanchor + 0.5 * coords["height"] + pad
 
+            num = _curve_samples(self.radius)
             act = axis.plot(
-                *make_node_data(x, y, self.radius, self.activation), color="blue", linewidth=5
+                *make_node_data(x, y, self.radius, self.activation, num=num),
+                color="blue",
+                linewidth=5
             )
             act[0].set_clip_path(rect)
 
@@ -371,9 +471,9 @@ def connect_nodes_to_rect(layer0, layer1, axis, inbound_kw={}):
         :param inbound_kw: padding and width when getting the rectangle connection points.
         :type inbound_kw: dict
     """
-    for xout, yout in layer0.outbound_node_connections():
-        for xin, yin in layer1.inbound_rect_connections(**inbound_kw):
-            axis.plot([xout, xin], [yout, yin], color="black", zorder=-10)
+    xout, yout = layer0.outbound_node_connections()
+    xin, yin = np.transpose(layer1.inbound_rect_connections(**inbound_kw))
+    _connect_points(axis, xout, yout, xin, yin)
 
 
 def connect_nodes_to_nodes(layer0, layer1, axis):
@@ -387,9 +487,9 @@ def connect_nodes_to_nodes(layer0, layer1, axis):
 
         :param axis: matplotlib axis
     """
-    for xout, yout in layer0.outbound_node_connections():
-        for xin, yin in layer1.inbound_node_connections():
-            axis.plot([xout, xin], [yout, yin], color="black", zorder=-10)
+    xout, yout = layer0.outbound_node_connections()
+    xin, yin = layer1.inbound_node_connections()
+    _connect_points(axis, xout, yout, xin, yin)
 
 
 def connect_rect_to_nodes(layer0, layer1, axis, outbound_kw={}):
@@ -406,9 +506,9 @@ def connect_rect_to_nodes(layer0, layer1, axis, outbound_kw={}):
         :param outbound_kw: padding and width when getting the rectangle connection points.
         :type outbound_kw: dict
     """
-    for xout, yout in layer0.outbound_rect_connections(**outbound_kw):
-        for xin, yin in layer1.inbound_node_connections():
-            axis.plot([xout, xin], [yout, yin], color="black", zorder=-10)
+    xout, yout = np.transpose(layer0.outbound_rect_connections(**outbound_kw))
+    xin, yin = layer1.inbound_node_connections()
+    _connect_points(axis, xout, yout, xin, yin)
 
 
 def connect_rect_to_rect(layer0, layer1, axis, outbound_kw={}, inbound_kw={}):
@@ -428,7 +528,26 @@ def connect_rect_to_rect(layer0, layer1, axis, outbound_kw={}, inbound_kw={}):
         :param inbound_kw: padding and width when getting the inbound rectangle connection points.
         :type inbound_kw: dict
     """
-    for xout, yout in layer0.outbound_rect_connections(**outbound_kw):
-        for xin, yin in layer1.inbound_rect_connections(**inbound_kw):
-            axis.plot([xout, xin], [yout, yin], color="black", zorder=-10)
+    xout, yout = np.transpose(layer0.outbound_rect_connections(**outbound_kw))
+    xin, yin = np.transpose(layer1.inbound_rect_connections(**inbound_kw))
+    _connect_points(axis, xout, yout, xin, yin)
 
+
+def _connect_points(axis, xout, yout, xin, yin):
+    """ Draw a line from every outbound point to every inbound point,
+        batched into a single LineCollection.
+
+        :param axis: matplotlib axis
+
+        :param xout, yout: coordinates of the outbound connection points.
+        :type xout, yout: numpy.ndarray
+
+        :param xin, yin: coordinates of the inbound connection points.
+        :type xin, yin: numpy.ndarray
+    """
+    Xout, Xin = np.meshgrid(xout, xin, indexing="ij")
+    Yout, Yin = np.meshgrid(yout, yin, indexing="ij")
+    start = np.stack([Xout, Yout], axis=-1)
+    end = np.stack([Xin, Yin], axis=-1)
+    segs = np.stack([start, end], axis=-2).reshape(-1, 2, 2)
+    axis.add_collection(LineCollection(segs, colors="black", zorder=-10))